@@ -1,24 +1,89 @@
 from django.contrib import admin
-from .models import *
+from .models import (Currency, PurchaseRequestStatus, FundCode, DeptCode, LinCode,
+    ActivityCode, PurchaseRequest, Vendor, FinanceCodes, Unit, Item, QuotationAnalysis,
+    RequestForQuotation, RequestForQuotationItem, PurchaseOrder, PurchaseOrderItem,
+    GoodsReceivedNote, GoodsReceivedNoteItem)
 # Register your models here.
 #admin.site.register(Region)
 #admin.site.register(Country)
-admin.site.register(Currency)
 #admin.site.register(Office)
-admin.site.register(PurchaseRequestStatus)
-admin.site.register(FundCode)
-admin.site.register(DeptCode)
-admin.site.register(LinCode)
-admin.site.register(ActivityCode)
-admin.site.register(PurchaseRequest)
-admin.site.register(Vendor)
-admin.site.register(FinanceCodes)
-admin.site.register(Unit)
-admin.site.register(Item)
-admin.site.register(QuotationAnalysis)
-admin.site.register(RequestForQuotation)
-admin.site.register(RequestForQuotationItem)
-admin.site.register(PurchaseOrder)
-admin.site.register(PurchaseOrderItem)
-admin.site.register(GoodsReceivedNote)
-admin.site.register(GoodsReceivedNoteItem)
\ No newline at end of file
+# Models that get by with the default ModelAdmin are registered in one call;
+# the ones needing list_select_related/raw_id_fields use @admin.register below.
+admin.site.register((Currency, PurchaseRequestStatus, FundCode, DeptCode,
+    LinCode, ActivityCode, Vendor, Unit))
+
+
+class DropdownQuerysetMixin(object):
+    """
+    Serves the big vendor/item FK dropdowns from slim, ordered querysets
+    instead of hydrating every column of every related row per change form.
+    """
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name in ('vendor', 'selected_vendor'):
+            kwargs['queryset'] = Vendor.objects.only('id', 'name').order_by('name')
+        elif db_field.name == 'item':
+            # _base_manager skips ItemManager's default select_related/
+            # prefetch; 1.8 raises InvalidQuery when a select_related
+            # relation is also deferred by only()
+            kwargs['queryset'] = Item._base_manager.only('id', 'description_pr')
+        return super(DropdownQuerysetMixin, self).formfield_for_foreignkey(db_field, request, **kwargs)
+
+
+@admin.register(PurchaseRequest)
+class PurchaseRequestAdmin(admin.ModelAdmin):
+    """
+    select_related the FKs rendered on the changelist (__str__ touches office)
+    so the page is a single JOINed query instead of one SELECT per row.
+    """
+    list_select_related = ('office', 'country', 'currency', 'status', 'originator')
+    raw_id_fields = ('originator',)
+
+
+@admin.register(Item)
+class ItemAdmin(admin.ModelAdmin):
+    list_select_related = ('purchase_request', 'unit')
+    search_fields = ('description_pr',)
+
+
+@admin.register(FinanceCodes)
+class FinanceCodesAdmin(admin.ModelAdmin):
+    list_select_related = ('item', 'fund_code', 'dept_code', 'office_code', 'lin_code', 'activity_code')
+    raw_id_fields = ('item',)
+
+
+@admin.register(QuotationAnalysis)
+class QuotationAnalysisAdmin(DropdownQuerysetMixin, admin.ModelAdmin):
+    list_select_related = ('selected_vendor',)
+
+
+@admin.register(RequestForQuotation)
+class RequestForQuotationAdmin(DropdownQuerysetMixin, admin.ModelAdmin):
+    list_select_related = ('purchase_request', 'vendor')
+
+
+@admin.register(RequestForQuotationItem)
+class RequestForQuotationItemAdmin(DropdownQuerysetMixin, admin.ModelAdmin):
+    list_select_related = ('request_for_quotation', 'item')
+    raw_id_fields = ('request_for_quotation', 'item')
+
+
+@admin.register(PurchaseOrder)
+class PurchaseOrderAdmin(DropdownQuerysetMixin, admin.ModelAdmin):
+    list_select_related = ('purchase_request', 'country', 'office', 'currency', 'vendor')
+
+
+@admin.register(PurchaseOrderItem)
+class PurchaseOrderItemAdmin(DropdownQuerysetMixin, admin.ModelAdmin):
+    list_select_related = ('purchase_order', 'item', 'item__unit')
+    raw_id_fields = ('purchase_order', 'item')
+
+
+@admin.register(GoodsReceivedNote)
+class GoodsReceivedNoteAdmin(admin.ModelAdmin):
+    list_select_related = ('purchase_request', 'country', 'office')
+
+
+@admin.register(GoodsReceivedNoteItem)
+class GoodsReceivedNoteItemAdmin(DropdownQuerysetMixin, admin.ModelAdmin):
+    list_select_related = ('goods_received_note', 'item')
+    raw_id_fields = ('goods_received_note', 'item')
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class EproConfig(AppConfig):
+    name = 'epro'
+    verbose_name = 'ePro'
+
+    def ready(self):
+        from . import signals  # noqa -- connects the signal receivers
@@ -1,48 +1,163 @@
+import copy
+
 from django.core.urlresolvers import reverse_lazy, reverse
 from django.core.exceptions import ValidationError
 
 from django.db.models import Sum
 from django import forms
-from django.forms import ModelForm, inlineformset_factory, HiddenInput, Textarea
 
 from django.utils.translation import ugettext_lazy as _
 
-from django.contrib.auth.models import User
-
-from django.views.generic.edit import CreateView, UpdateView
-
 from crispy_forms.helper import FormHelper
-from crispy_forms.layout import Submit, Reset, Button, HTML, Layout, Field, Div, Column
+from crispy_forms.layout import Submit, Reset, Layout, Field, Div, Column
 from crispy_forms.bootstrap import FormActions, AppendedText
 
-from .models import Country, Office, Currency, UserProfile, PurchaseRequest, Item, FinanceCodes, ItemAttachment
+from .models import (Country, Office, Currency, UserProfile, PurchaseRequest, Item, FinanceCodes,
+    ItemAttachment, FundCode, DeptCode, LinCode, ActivityCode, Unit)
+
+
+# This module is imported while the root URLconf is still loading, so the
+# constant has to stay lazy (an eager reverse() here would raise); hoisting
+# it just avoids rebuilding the lazy proxy in every form __init__ — the
+# actual URLconf lookup still happens per string coercion.
+_PR_NEW_URL = reverse_lazy('pr_new')
+
+# The item-create modal renders the attachment form with the 0 sentinel
+# before a real item exists; Dropzone still needs a non-empty action
+# attribute to initialize, so share one lazy proxy for the placeholder URL.
+_ITEM_ATTACHMENT_SENTINEL_URL = reverse_lazy('item_attachment', kwargs={'pk': 0})
+
+
+# The crispy Layout trees below are immutable and parameter-free, so they are
+# built once at import time instead of being re-allocated in every form
+# __init__; crispy does not mutate the tree during rendering.
+_PR_FORM_LAYOUT = Layout(
+    Div(
+        Div(
+            Column(
+                Field('country',),
+                css_class="col-sm-6",
+            ),
+            Column(
+                Field('originating_office',),
+                css_class="col-sm-6",
+            ),
+            css_class="row",
+        ),
+        Div(
+            Column(
+                Field('project_reference',),
+                css_class="col-sm-12",
+            ),
+            css_class="row",
+        ),
+        Div(
+            Column(
+                Field('delivery_address',),
+                css_class="col-sm-6",
+            ),
+            Column(
+                Field('required_date',),
+                css_class="col-sm-6",
+            ),
+            css_class="row",
+        ),
+        Div(
+            Column(
+                Field('pr_currency',),
+                css_class="col-xs-6",
+            ), Column(
+                Field('dollar_exchange_rate',),
+                css_class="col-xs-6",
+            ),
+            css_class="row",
+        ),
+        Div(
+            Column(
+                Field('approverOne',),
+                css_class="col-sm-6",
+            ), Column(
+                Field('approverTwo',),
+                css_class="col-sm-6",
+            ),
+            css_class="row",
+        ),
+        css_class="col-xs-12",
+    ),
+)
+
+_FINANCE_CODES_LAYOUT = Layout(
+    Div(
+        Column(
+            Field('gl_account',),
+            Field('fund_code',),
+            Field('dept_code',),
+            Field('office_code',),
+            css_class="col-sm-6",
+        ), Column(
+            Field('lin_code',),
+            Field('activity_code',),
+            Field('employee_id',),
+            Field(AppendedText('allocation_percent', '%'),),
+            css_class="col-sm-6",
+        ),
+        css_class="row",
+    ),
+    Div(
+        Column(
+            FormActions(
+                Submit('save', 'Save changes', css_id='id_submit_finance_codes_btn', css_class='btn-sm btn-primary'),
+                Reset('reset', 'Cancel', css_id='id_cancel_finance_codes_btn', css_class='btn-sm btn-warning')
+            ),
+            css_class="col-sm-12",
+        ),
+        css_class="row",
+    ),
+)
 
 
 """
 A generic method used for setting up similar bootstrap properties on crispy forms
 """
+# Configure the common helper attributes once on a prototype; a shallow copy
+# per form is much cheaper than allocating a FormHelper and setting all nine
+# attributes on every form instantiation.
+_HELPER_PROTOTYPE = FormHelper()
+_HELPER_PROTOTYPE.form_class = 'form-horizontal'
+_HELPER_PROTOTYPE.label_class = 'col-sm-2'
+_HELPER_PROTOTYPE.field_class = 'col-sm-10'
+_HELPER_PROTOTYPE.html5_required = True
+_HELPER_PROTOTYPE.form_show_labels = True
+_HELPER_PROTOTYPE.error_text_inline = True
+_HELPER_PROTOTYPE.help_text_inline = True
+_HELPER_PROTOTYPE.form_show_errors = True
+
 def setup_boostrap_helpers(formtag=False):
-    helper = FormHelper()
-    helper.form_class = 'form-horizontal'
-    helper.label_class = 'col-sm-2'
-    helper.field_class = 'col-sm-10'
-    helper.html5_required = True
-    helper.form_show_labels = True
-    helper.error_text_inline = True
-    helper.help_text_inline = True
-    helper.form_show_errors = True
+    helper = copy.copy(_HELPER_PROTOTYPE)
+    # rebind the one mutable container so add_input() on a form's helper
+    # cannot leak submit buttons into the shared prototype
+    helper.inputs = []
     helper.form_tag = formtag
     return helper
 
 
 class PurchaseRequestForm(forms.ModelForm):
-    approverOne = forms.CharField(label=_('Approver1'), max_length=100, required=False,
-         help_text="<span style='color:red'>*</span> This is the person who manages the Fund")
-    approverTwo = forms.CharField(label=_('Approver2'), max_length=100, required=False,
+    # ModelChoiceFields validate the submitted pk and hand back the model
+    # instance, so the view no longer needs a second .get() per field to
+    # resolve the value after submission. The TextInput widgets keep these
+    # rendered as <input> elements: the select2 3.x setup in pr_form_js.html
+    # feeds them via its data: option, which it refuses on <select>.
+    approverOne = forms.ModelChoiceField(label=_('Approver1'), queryset=UserProfile.objects.only('id', 'name'), required=False,
+        widget=forms.TextInput,
+        help_text="<span style='color:red'>*</span> This is the person who manages the Fund")
+    approverTwo = forms.ModelChoiceField(label=_('Approver2'), queryset=UserProfile.objects.only('id', 'name'), required=False,
+        widget=forms.TextInput,
         help_text="Refer to your <abbr title='Approval Authority Matrix'>AAM</abbr> to determine if you need to specify a second approval.")
-    originating_office = forms.CharField(label=_("Originating Office"), max_length=100, required=False,
+    originating_office = forms.ModelChoiceField(label=_("Originating Office"), queryset=Office.objects.only('id', 'name'), required=False,
+        widget=forms.TextInput,
         help_text="<span style='color:red'>*</span> The Office in which this PR is originated")
-    pr_currency = forms.CharField(label=_("PR Currency"), max_length=100, required=True,
+    pr_currency = forms.ModelChoiceField(label=_("PR Currency"), queryset=Currency.objects.only('id', 'code'), required=True,
+        widget=forms.TextInput,
         help_text="<span style='color:red'>*</span> This the currency in which the transaction occurs.")
 
     class Meta:
@@ -77,6 +192,9 @@ class PurchaseRequestForm(forms.ModelForm):
         pr_pk = kwargs.pop('pk', None)
         country_id = kwargs.pop('country_id', None)
         super(PurchaseRequestForm, self).__init__(*args, **kwargs)
+        # Rendering the choices only needs the pk and the label column, so
+        # defer everything else instead of hydrating full rows.
+        self.fields['country'].queryset = Country.objects.only('id', 'name').order_by('name')
         self.fields['country'].empty_label = ''
         self.fields['project_reference'].widget.attrs['placeholder'] = _('Project Reference')
         self.fields['delivery_address'].widget.attrs['placeholder'] = _('Delivery Address')
@@ -85,66 +203,13 @@ class PurchaseRequestForm(forms.ModelForm):
         self.helper = setup_boostrap_helpers(formtag=True)
         #self.helper.form_class = 'form-inline'
         self.helper.attrs = {'id': 'id_prform', }
-        self.helper.form_action = reverse_lazy('pr_edit' if pr_pk else 'pr_new', kwargs = {'pk': pr_pk} if pr_pk else None)
+        self.helper.form_action = reverse('pr_edit', kwargs={'pk': pr_pk}) if pr_pk else _PR_NEW_URL
         self.helper.add_input(Submit('submit', 'Submit', css_class='btn-sm btn-primary'))
         self.helper.add_input(Reset('reset', 'Reset', css_class='btn-sm btn-warning'))
         self.helper.form_show_labels = False
         self.helper.label_class = 'col-sm-0'
         self.helper.field_class = 'col-xs-12'
-        self.helper.layout = Layout(
-            Div(
-                Div(
-                    Column(
-                        Field('country',),
-                        css_class="col-sm-6",
-                    ),
-                    Column(
-                        Field('originating_office',),
-                        css_class="col-sm-6",
-                    ),
-                    css_class="row",
-                ),
-                Div(
-                    Column(
-                        Field('project_reference',),
-                        css_class="col-sm-12",
-                    ),
-                    css_class="row",
-                ),
-                Div(
-                    Column(
-                        Field('delivery_address',),
-                        css_class="col-sm-6",
-                    ),
-                    Column(
-                        Field('required_date',),
-                        css_class="col-sm-6",
-                    ),
-                    css_class="row",
-                ),
-                Div(
-                    Column(
-                        Field('pr_currency',),
-                        css_class="col-xs-6",
-                    ), Column(
-                        Field('dollar_exchange_rate',),
-                        css_class="col-xs-6",
-                    ),
-                    css_class="row",
-                ),
-                Div(
-                    Column(
-                        Field('approverOne',),
-                        css_class="col-sm-6",
-                    ), Column(
-                        Field('approverTwo',),
-                        css_class="col-sm-6",
-                    ),
-                    css_class="row",
-                ),
-                css_class="col-xs-12",
-            ),
-        )
+        self.helper.layout = _PR_FORM_LAYOUT
 
 class PurchaseRequestItemForm(forms.ModelForm):
     class Meta:
@@ -165,8 +230,9 @@ class PurchaseRequestItemForm(forms.ModelForm):
             url = 'item_new'
             url_params = {'pr': kwargs['initial']['purchase_request']}
 
+        self.fields['unit'].queryset = Unit.objects.only('id', 'mnemonic', 'description')
         self.fields['unit'].empty_label = ''
-        self.helper.form_action = reverse_lazy(url, kwargs=url_params)
+        self.helper.form_action = reverse(url, kwargs=url_params)
         self.helper.form_id = 'id_pr_item_form'
         self.helper.add_input(Submit('submit', 'Save', css_class='btn-sm btn-primary'))
         self.helper.add_input(Reset('reset', 'Reset', css_class='btn-sm btn-warning'))
@@ -185,7 +251,12 @@ class PurchaseRequestItemAttachmentForm(forms.ModelForm):
         self.helper = setup_boostrap_helpers(formtag=True)
         self.helper.form_id = 'id_attachment_form'
         self.helper.form_class = "dropzone"
-        self.helper.form_action = reverse_lazy("item_attachment", kwargs={"pk": kwargs['initial'].get('item', 0)})
+        # resolve eagerly when a real item exists; the 0 sentinel falls back
+        # to the module-level placeholder so the action attribute stays
+        # non-empty for Dropzone
+        item_id = kwargs.get('initial', {}).get('item')
+        self.helper.form_action = (reverse("item_attachment", kwargs={"pk": item_id})
+            if item_id else _ITEM_ATTACHMENT_SENTINEL_URL)
         #self.helper.add_input(Submit('submit', 'Upload', css_class='btn-sm btn-primary'))
 
     def clean_file(self):
@@ -196,14 +267,6 @@ class PurchaseRequestItemAttachmentForm(forms.ModelForm):
             pass
         return file
 
-    def save(self, commit=True):
-        instance = super(PurchaseRequestItemAttachmentForm, self).save(commit=False)
-        instance.file_type = self.cleaned_data['file'].content_type
-        instance.file_size = self.cleaned_data['file'].size
-        if commit:
-            instance.save()
-        return instance
-
 
 class FinanceCodesForm(forms.ModelForm):
     """
@@ -219,11 +282,11 @@ class FinanceCodesForm(forms.ModelForm):
     def clean_gl_account(self):
         gl_account = self.cleaned_data.get('gl_account', None)
         try:
-            gl_account_length = len(str(int(gl_account)))
-        except Exception as e:
-            raise ValidationError(_("GL Account must be a five digits number"))
+            gl_account = int(gl_account)
+        except (TypeError, ValueError):
+            raise ValidationError(_("GL Account must be a four digits number"))
 
-        if gl_account_length > 4 or gl_account_length < 4:
+        if not 1000 <= gl_account <= 9999:
             raise ValidationError(_("GL Account must be a four digits number"))
         return gl_account
 
@@ -241,9 +304,13 @@ class FinanceCodesForm(forms.ModelForm):
         if not allocation_percent:
             raise ValidationError(_("Allocation_percent is required."))
 
-        total = item.finance_codes.aggregate(Sum('allocation_percent'))
-        if not self.instance.pk and total['allocation_percent__sum']:
-            if ( float(total['allocation_percent__sum']) + allocation_percent) > 100:
+        # Use the sum precomputed by the view when available so that a page
+        # with many finance-codes forms does not fire one aggregate per form.
+        allocation_sum = self._allocation_sum
+        if allocation_sum is None:
+            allocation_sum = item.finance_codes.aggregate(Sum('allocation_percent'))['allocation_percent__sum']
+        if not self.instance.pk and allocation_sum:
+            if ( float(allocation_sum) + allocation_percent) > 100:
                 raise ValidationError(_("Allocations cannot be more than 100%"))
         else:
             if allocation_percent > 100:
@@ -252,6 +319,7 @@ class FinanceCodesForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         finance_codes_id = kwargs.pop('pk', None)
+        self._allocation_sum = kwargs.pop('allocation_sum', None)
         super(FinanceCodesForm, self).__init__(*args, **kwargs)
         self.helper = setup_boostrap_helpers(formtag=True)
         if finance_codes_id:
@@ -261,7 +329,12 @@ class FinanceCodesForm(forms.ModelForm):
             form_action = "financecodes_new"
             params = {"item_id": kwargs['initial'].get('item', None)}
         #print("form_action: %s params: %s" % (form_action, params))
-        self.helper.form_action = reverse_lazy(form_action, kwargs=params)
+        self.helper.form_action = reverse(form_action, kwargs=params)
+        self.fields['fund_code'].queryset = FundCode.objects.only('id', 'code')
+        self.fields['dept_code'].queryset = DeptCode.objects.only('id', 'code')
+        self.fields['office_code'].queryset = Office.objects.only('id', 'name')
+        self.fields['lin_code'].queryset = LinCode.objects.only('id', 'lin_code')
+        self.fields['activity_code'].queryset = ActivityCode.objects.only('id', 'activity_code')
         self.fields['fund_code'].empty_label = ''
         self.fields['dept_code'].empty_label = ''
         self.fields['office_code'].empty_label = ''
@@ -269,31 +342,4 @@ class FinanceCodesForm(forms.ModelForm):
         self.helper.form_id = 'id_finance_codes_form'
         self.helper.label_class = 'col-sm-offset-0 col-sm-5'
         self.helper.field_class = 'col-sm-7'
-        self.helper.layout = Layout(
-            Div(
-                Column(
-                    Field('gl_account',),
-                    Field('fund_code',),
-                    Field('dept_code',),
-                    Field('office_code',),
-                    css_class="col-sm-6",
-                ), Column(
-                    Field('lin_code',),
-                    Field('activity_code',),
-                    Field('employee_id',),
-                    Field(AppendedText('allocation_percent', '%'),),
-                    css_class="col-sm-6",
-                ),
-                css_class="row",
-            ),
-            Div(
-                Column(
-                    FormActions(
-                        Submit('save', 'Save changes', css_id='id_submit_finance_codes_btn', css_class='btn-sm btn-primary'),
-                        Reset('reset', 'Cancel', css_id='id_cancel_finance_codes_btn', css_class='btn-sm btn-warning')
-                    ),
-                    css_class="col-sm-12",
-                ),
-                css_class="row",
-            ),
-        )
+        self.helper.layout = _FINANCE_CODES_LAYOUT
@@ -100,25 +100,24 @@ class PurchaseRequestMixin(object):
         return kwargs
 
     def form_valid(self, form):
-        approverOne = self.request.POST.get('approverOne', None)
-        if approverOne:
-            approver1= UserProfile.objects.get(pk=approverOne)
+        # The form's ModelChoiceFields have already validated the submitted
+        # pks and resolved them to instances, so reuse cleaned_data instead
+        # of re-fetching every object from the raw POST payload.
+        approver1 = form.cleaned_data.get('approverOne', None)
+        if approver1:
             form.instance.approver1 = approver1
 
-        approverTwo = self.request.POST.get('approverTwo', None)
-        if approverTwo:
-            approver2 = UserProfile.objects.get(pk=approverTwo)
+        approver2 = form.cleaned_data.get('approverTwo', None)
+        if approver2:
             form.instance.approver2 = approver2
 
-        originating_office = self.request.POST.get('originating_office', None)
+        originating_office = form.cleaned_data.get('originating_office', None)
         if originating_office:
-            office = Office.objects.get(pk=originating_office)
-            form.instance.office = office
+            form.instance.office = originating_office
 
-        pr_currency = self.request.POST.get('pr_currency', None)
+        pr_currency = form.cleaned_data.get('pr_currency', None)
         if pr_currency:
-            currency = Currency.objects.get(pk=pr_currency)
-            form.instance.currency = currency
+            form.instance.currency = pr_currency
 
         return super(PurchaseRequestMixin, self).form_valid(form)
 
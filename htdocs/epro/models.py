@@ -1,17 +1,15 @@
 from __future__ import unicode_literals
-import datetime, time, logging
+import logging
 from decimal import Decimal
 
 from django.core.urlresolvers import reverse_lazy
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 
-from django.db.models import Q, Sum, Max, Min, Count
-from django.db import models
-from django.forms.models import model_to_dict
-
+from django.db.models import F, Q, Sum, Max, Min, Count
+from django.db import models, transaction
 from django.utils import timezone
-from django.utils.timezone import utc
+from django.utils.encoding import python_2_unicode_compatible
 
 from django.contrib.auth.models import User
 
@@ -20,6 +18,22 @@ from djangocosign.models import UserProfile, Region, Country, Office
 from .fields import USDCurrencyField
 
 
+TWO_PLACES = Decimal('0.01')
+
+
+def _build_snapshot_func(attnames):
+    """
+    Compiles a snapshot function for one model class: a single dict literal
+    of subscript reads against the instance __dict__, instead of a generic
+    loop over field names. Same codegen trick attrs uses for __init__.
+    """
+    src = 'def _snap(d):\n    return {%s}' % ', '.join(
+        "'%s': d['%s']" % (a, a) for a in attnames)
+    namespace = {}
+    exec(src, namespace)
+    return namespace['_snap']
+
+
 class ModelDiffMixin(object):
     """
     A model mixin that tracks model fields' values and provide some useful api
@@ -45,10 +59,23 @@ class ModelDiffMixin(object):
         >>> p.get_field_diff('rank')
         (0, 42)
         >>>
+
+    Subclasses may set ``diff_fields`` to a tuple of attnames to restrict the
+    snapshot to the columns they actually compare; views can then pair it
+    with ``.only(*Model.diff_fields)`` so big TextFields stay out of memory.
     """
 
+    diff_fields = None
+
     def __init__(self, *args, **kwargs):
         super(ModelDiffMixin, self).__init__(*args, **kwargs)
+        cls = type(self)
+        if '_diff_attnames' not in cls.__dict__:
+            # computed once per model class; walking _meta.concrete_fields
+            # on every snapshot is wasted work
+            cls._diff_attnames = tuple(f.attname for f in cls._meta.concrete_fields)
+            cls._diff_snap = staticmethod(_build_snapshot_func(
+                cls.diff_fields or cls._diff_attnames))
         self.__initial = self._dict
 
     @property
@@ -64,7 +91,7 @@ class ModelDiffMixin(object):
 
     @property
     def changed_fields(self):
-        return self.diff.keys()
+        return list(self.diff)
 
     def get_field_diff(self, field_name):
         """
@@ -81,25 +108,40 @@ class ModelDiffMixin(object):
 
     @property
     def _dict(self):
-        return model_to_dict(self, fields=[field.name for field in
-                             self._meta.fields])
+        # read raw column values (FK ids via attname) straight from the
+        # instance __dict__ so no descriptors fire; the generated function
+        # raises KeyError for deferred fields, where we fall back to getattr
+        cls = type(self)
+        try:
+            return cls._diff_snap(self.__dict__)
+        except KeyError:
+            attnames = cls.diff_fields or cls._diff_attnames
+            return dict((a, getattr(self, a)) for a in attnames)
     class Meta:
         abstract = True
 
 
 def validate_even(value):
-    if value % 2 != 0:
+    try:
+        if value % 2 != 0:
+            raise ValidationError('%s is not an even number' % value)
+    except TypeError:
         raise ValidationError('%s is not an even number' % value)
 
 def validate_positive(value):
-    if value <= 0:
+    try:
+        if value <= 0:
+            raise ValidationError('%s is not greater than zero' % value)
+    except TypeError:
         raise ValidationError('%s is not greater than zero' % value)
 
 def validate_gl_account(value):
     try:
-        if len(str(int(value))) > 4:
-            raise ValidationError("%s must be a four digits long number" % value)
-    except Exception as e:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValidationError("%s must be a four digits long number" % value)
+    # integer range check instead of the int->str->len round-trip
+    if not 0 <= value <= 9999:
         raise ValidationError("%s must be a four digits long number" % value)
 
 
@@ -113,22 +155,24 @@ class CommonBaseAbstractModel(models.Model):
         abstract = True
 
     def save(self, *args, **kwargs):
-        now_utc = datetime.datetime.utcnow().replace(tzinfo=utc)
-        if self.id:
-            self.updated = now_utc
-        else:
+        # bulk callers can pass now= so a loop of saves shares one timestamp
+        # instead of constructing a fresh aware datetime per row
+        now_utc = kwargs.pop('now', None) or timezone.now()
+        # _state.adding distinguishes insert vs update without touching the
+        # pk descriptor and stays correct for non-integer primary keys
+        if self._state.adding:
             self.created = now_utc
+        else:
+            self.updated = now_utc
         super(CommonBaseAbstractModel, self).save(*args, **kwargs)
 
 
+@python_2_unicode_compatible
 class Currency(CommonBaseAbstractModel):
     country = models.ForeignKey(Country, blank=False, null=False, on_delete=models.CASCADE, related_name="currencies")
     code = models.CharField(unique=True, max_length=3, null=False, blank=False)
     name = models.CharField(max_length=50, null=True, blank=True)
 
-    def __unicode__(self):
-        return self.code
-
     def __str__(self):
         return self.code
 
@@ -138,28 +182,24 @@ class Currency(CommonBaseAbstractModel):
         ordering = ['country', 'code']
 
 
+@python_2_unicode_compatible
 class FundCode(CommonBaseAbstractModel):
     country = models.ForeignKey(Country, related_name='fund_codes', blank=False, null=False, on_delete=models.CASCADE)
     code = models.CharField(unique=True, max_length=5, null=False, blank=False, db_index=True)
 
-    def __unicode__(self):
-        return u'%s' % self.code
-
-    def __ustr__(self):
-        return u'%s' % self.code
+    def __str__(self):
+        return '%s' % self.code
 
     class Meta:
         verbose_name = 'Fund Code'
         ordering = ['code']
 
 
+@python_2_unicode_compatible
 class DeptCode(CommonBaseAbstractModel):
     country = models.ForeignKey(Country, related_name='dept_codes', blank=False, null=False, on_delete=models.CASCADE)
     code = models.CharField(unique=True, max_length=5, null=False, blank=False, db_index=True)
 
-    def __unicode__(self):
-        return u'%s' % self.code
-
     def __str__(self):
         return '%s' % self.code
 
@@ -168,13 +208,11 @@ class DeptCode(CommonBaseAbstractModel):
         ordering = ['code']
 
 
+@python_2_unicode_compatible
 class LinCode(CommonBaseAbstractModel):
     country = models.ForeignKey(Country, related_name='lin_codes', blank=False, null=False, on_delete=models.CASCADE)
     lin_code = models.CharField(unique=True, max_length=9, null=True, blank=True)
 
-    def __unicode__(self):
-        return u'%s' % self.lin_code
-
     def __str__(self):
         return '%s' % self.lin_code
 
@@ -183,13 +221,11 @@ class LinCode(CommonBaseAbstractModel):
         ordering = ['lin_code']
 
 
+@python_2_unicode_compatible
 class ActivityCode(CommonBaseAbstractModel):
     country = models.ForeignKey(Country, related_name='activity_codes', blank=False, null=False, on_delete=models.CASCADE)
     activity_code = models.CharField(unique=True, max_length=9, null=True, blank=True)
 
-    def __unicode__(self):
-        return u'%s' % self.activity_code
-
     def __str__(self):
         return '%s' % self.activity_code
 
@@ -198,6 +234,7 @@ class ActivityCode(CommonBaseAbstractModel):
         ordering = ['activity_code']
 
 
+@python_2_unicode_compatible
 class PurchaseRequestStatus(CommonBaseAbstractModel):
     """ A PR goes through these statuses.
     STATUS_DRAFT = 'drafted'
@@ -213,9 +250,6 @@ class PurchaseRequestStatus(CommonBaseAbstractModel):
     """
     status = models.CharField(max_length=50, null=False, blank=False)
 
-    def __unicode__(self):
-        return u'%s' % self.status
-
     def __str__(self):
         return '%s' % self.status
 
@@ -225,26 +259,73 @@ class PurchaseRequestStatus(CommonBaseAbstractModel):
         ordering = ['status']
 
 
+# The pk of the 'Drafted' status is looked up once per process instead of on
+# every PR create; signals.py invalidates it if the status rows change.
+_drafted_status_pk_cache = []
+
+def get_drafted_status_pk():
+    if not _drafted_status_pk_cache:
+        _drafted_status_pk_cache.append(
+            PurchaseRequestStatus.objects.values_list('pk', flat=True).get(status='Drafted'))
+    return _drafted_status_pk_cache[0]
+
+def invalidate_drafted_status_pk():
+    del _drafted_status_pk_cache[:]
+
+
+class OfficePrCounter(models.Model):
+    """
+    Per-office counter backing PurchaseRequest.sno assignment. Incremented
+    atomically with an UPDATE so concurrent PR creates cannot draw the same
+    serial number, and so assigning a number no longer scans MAX(sno).
+    """
+    office = models.OneToOneField(Office, related_name='pr_counter', on_delete=models.CASCADE)
+    sno = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Office PR Counter'
+
+    @classmethod
+    def next_sno(cls, office):
+        with transaction.atomic():
+            counter, created = cls.objects.get_or_create(office=office)
+            if created:
+                # seed from the legacy MAX(sno) the first time an office uses the counter
+                max_sno = PurchaseRequest.objects.filter(office=office.pk).aggregate(Max('sno'))['sno__max'] or 0
+                cls.objects.filter(pk=counter.pk, sno__lt=max_sno).update(sno=max_sno)
+            cls.objects.filter(pk=counter.pk).update(sno=F('sno') + 1)
+            return cls.objects.values_list('sno', flat=True).get(pk=counter.pk)
+
+
 class PurchaseRequestManager(models.Manager):
+    def get_queryset(self):
+        # __str__ and most list views dereference these FKs, so join them
+        # up-front instead of issuing one SELECT per row (N+1)
+        return super(PurchaseRequestManager, self).get_queryset().select_related(
+            'office', 'country', 'currency', 'status', 'originator', 'approver1', 'approver2')
+
     @property
     def goods(self):
-        return self.get_query_set().filter(pr_type=PurchaseRequest.TYPE_GOODS)
+        return self.get_queryset().filter(pr_type=PurchaseRequest.TYPE_GOODS)
 
     @property
     def services(self):
-        return self.get_query_set().filter(pr_type=PurchaseRequest.TYPE_SERVICES)
+        return self.get_queryset().filter(pr_type=PurchaseRequest.TYPE_SERVICES)
 
 
+@python_2_unicode_compatible
 class PurchaseRequest(CommonBaseAbstractModel):
-    TYPE_GOODS = '0'
-    TYPE_SERVICES = '1'
+    # stored as small ints rather than varchar(50); the rows and any index
+    # over these columns stay much narrower
+    TYPE_GOODS = 0
+    TYPE_SERVICES = 1
     PR_TYPE_CHOICES = (
         (TYPE_GOODS, 'Goods'),
         (TYPE_SERVICES, 'Services'),
     )
 
-    EXPENSE_TYPE_PROGRAM = '0'
-    EXPENSE_TYPE_OPERATIONAL = '1'
+    EXPENSE_TYPE_PROGRAM = 0
+    EXPENSE_TYPE_OPERATIONAL = 1
     EXPENSE_TYPE_CHOICES = (
         (EXPENSE_TYPE_PROGRAM, 'Program'),
         (EXPENSE_TYPE_OPERATIONAL, 'Operational'),
@@ -276,8 +357,8 @@ class PurchaseRequest(CommonBaseAbstractModel):
     submission_date = models.DateField(auto_now=False, auto_now_add=False, blank=True, null=True)
     status = models.ForeignKey(PurchaseRequestStatus, blank=False, null=False, on_delete=models.DO_NOTHING)
     status_notes = models.TextField(null=True, blank=True)
-    pr_type = models.CharField(max_length=50, choices=PR_TYPE_CHOICES, default=TYPE_GOODS, null=True, blank=True)
-    expense_type = models.CharField(max_length=50, choices=EXPENSE_TYPE_CHOICES, null=True, blank=True)
+    pr_type = models.PositiveSmallIntegerField(choices=PR_TYPE_CHOICES, default=TYPE_GOODS, null=True, blank=True, db_index=True)
+    expense_type = models.PositiveSmallIntegerField(choices=EXPENSE_TYPE_CHOICES, null=True, blank=True)
     processing_office = models.ForeignKey(Office, related_name='pr_processing_office', blank=True, null=True, on_delete=models.SET_NULL)
     assignedBy = models.ForeignKey(UserProfile, blank=True, null=True, related_name='assigner', on_delete=models.SET_NULL)
     assignedTo = models.ForeignKey(UserProfile, blank=True, null=True, related_name='assignee', on_delete=models.SET_NULL)
@@ -290,9 +371,6 @@ class PurchaseRequest(CommonBaseAbstractModel):
     cancellation_date = models.DateTimeField(auto_now=False, auto_now_add=False, blank=True, null=True)
     objects = PurchaseRequestManager() # Changing the default manager
 
-    def __unicode__(self):
-        return '%s-%s: %s' % (self.office.name, self.sno, self.project_reference)
-
     def __str__(self):
         return '%s-%s: %s' % (self.office.name, self.sno, self.project_reference)
 
@@ -307,16 +385,11 @@ class PurchaseRequest(CommonBaseAbstractModel):
             raise ValidationError(_('Draft Purchase Requests may not have a submission date.'))
 
     def save(self, *args, **kwargs):
-        if not self.id:
-            status = PurchaseRequestStatus.objects.get(status='Drafted')
-            self.status = status
+        if self._state.adding:
+            self.status_id = get_drafted_status_pk()
             self.type = PurchaseRequest.TYPE_GOODS
             # increase the PR serial number by one for by office
-            pr_count_by_office = PurchaseRequest.objects.filter(office=self.office.pk).aggregate(Max('sno'))['sno__max']
-            if pr_count_by_office is None:
-                pr_count_by_office = 0
-            pr_count_by_office = pr_count_by_office + 1
-            self.sno = pr_count_by_office
+            self.sno = OfficePrCounter.next_sno(self.office)
 
         super(PurchaseRequest, self).save(*args, **kwargs)
 
@@ -325,6 +398,9 @@ class PurchaseRequest(CommonBaseAbstractModel):
         verbose_name_plural = "Purchase Requests"
         ordering = ['country', 'office']
         get_latest_by = "submission_date"
+        # composite indexes for the per-office sno lookups and the
+        # country/office ordering used by the list views
+        index_together = (('office', 'sno'), ('country', 'office'))
 
 
 class PurchaseRequestLog(CommonBaseAbstractModel):
@@ -337,6 +413,7 @@ class PurchaseRequestLog(CommonBaseAbstractModel):
     changed_by = models.ForeignKey(UserProfile, null=True, blank=False, related_name='log_entries', on_delete=models.DO_NOTHING)
 
 
+@python_2_unicode_compatible
 class Vendor(CommonBaseAbstractModel):
     country = models.ForeignKey(Country, related_name='vendors', null=True, blank=False, on_delete=models.SET_NULL)
     name = models.CharField(max_length=100, null=False, blank=False)
@@ -349,9 +426,6 @@ class Vendor(CommonBaseAbstractModel):
     reason_black_listed = models.CharField(max_length=255, null=True, blank=True)
     black_listed_date = models.DateField(null=True, blank=True)
 
-    def __unicode__(self):
-        return self.name
-
     def __str__(self):
         return self.name
 
@@ -361,13 +435,11 @@ class Vendor(CommonBaseAbstractModel):
     class Meta:
         verbose_name = 'Vendor'
 
+@python_2_unicode_compatible
 class Unit(CommonBaseAbstractModel):
     mnemonic = models.CharField(max_length=4, null=False, blank=False)
     description = models.CharField(max_length=100, null=True, blank=True)
 
-    def __unicode__(self):
-        return "%s - %s" % (self.mnemonic, self.description)
-
     def __str__(self):
         return "%s - %s" % (self.mnemonic, self.description)
 
@@ -376,6 +448,18 @@ class Unit(CommonBaseAbstractModel):
         ordering = ["description"]
 
 
+class ItemManager(models.Manager):
+    def get_queryset(self):
+        # save() reads purchase_request.dollar_exchange_rate and templates
+        # render the unit, so fetch both with the item in a single query;
+        # finance codes are prefetched in full — the pr_view template renders
+        # their columns and the default-codes views clone them, so a slim
+        # .only() here would turn every other field into a deferred load
+        return super(ItemManager, self).get_queryset().select_related(
+            'unit', 'purchase_request').prefetch_related('finance_codes')
+
+
+@python_2_unicode_compatible
 class Item(CommonBaseAbstractModel):
     item_sno = models.PositiveIntegerField(verbose_name='SNo')
     purchase_request = models.ForeignKey(PurchaseRequest,
@@ -400,41 +484,70 @@ class Item(CommonBaseAbstractModel):
                                         validators=[MinValueValidator(0.0)],
                                         verbose_name='Price estimated in US Dollars Subtotal',)
     default_finance_codes = models.BooleanField(default=False)
-
-    def __unicode__(self):
-        return u'%s' % (self.description_pr)
+    objects = ItemManager() # Changing the default manager
 
     def __str__(self):
         return '%s' % (self.description_pr)
 
     def save(self, *args, **kwargs):
+        exchange_rate = kwargs.pop('exchange_rate', None)
+        if exchange_rate is None:
+            # served from the FK cache when the item came through ItemManager's
+            # select_related; bulk callers can pass the rate to skip the fetch
+            exchange_rate = self.purchase_request.dollar_exchange_rate
         if not self.description_po and self.description_pr:
             self.description_po = self.description_pr
-        self.price_estimated_local_subtotal = round(self.price_estimated_local * self.quantity_requested,2)
-        self.price_estimated_usd = round(self.price_estimated_local / self.purchase_request.dollar_exchange_rate, 2)
-        self.price_estimated_usd_subtotal = round(self.price_estimated_usd * self.quantity_requested, 2)
-
-        if not self.id:
-            # increase the item serial number by one for the current Purchase Request
-            items_count_by_pr = Item.objects.filter(purchase_request=self.purchase_request.pk).aggregate(Max('item_sno'))['item_sno__max']
-            if items_count_by_pr is None:
-                items_count_by_pr = 0
-            items_count_by_pr = items_count_by_pr + 1
-            self.item_sno = items_count_by_pr
+        # quantize keeps the arithmetic in Decimal; round() coerces to float
+        self.price_estimated_local_subtotal = (self.price_estimated_local * self.quantity_requested).quantize(TWO_PLACES)
+        self.price_estimated_usd = (self.price_estimated_local / exchange_rate).quantize(TWO_PLACES)
+        self.price_estimated_usd_subtotal = (self.price_estimated_usd * self.quantity_requested).quantize(TWO_PLACES)
+
+        if self._state.adding:
+            # increase the item serial number by one for the current Purchase Request;
+            # the ordered values_list is served from the tip of the
+            # (purchase_request, item_sno) index and returns a plain scalar
+            last_sno = Item.objects.filter(purchase_request_id=self.purchase_request_id).order_by(
+                '-item_sno').values_list('item_sno', flat=True).first() or 0
+            self.item_sno = last_sno + 1
         super(Item, self).save(*args, **kwargs)
 
+    @classmethod
+    def bulk_create_for_pr(cls, pr, items, batch_size=500):
+        """
+        Inserts many items for one PR in O(1) queries: a single MAX() to
+        anchor the serial numbers, the subtotal arithmetic done in Python,
+        and one bulk INSERT. The per-row save() side-effects (per-item MAX,
+        per-item exchange-rate fetch) are intentionally skipped.
+        """
+        max_sno = cls.objects.filter(purchase_request=pr.pk).aggregate(m=Max('item_sno'))['m'] or 0
+        rate = pr.dollar_exchange_rate
+        now_utc = timezone.now()
+        for sno, item in enumerate(items, start=max_sno + 1):
+            item.purchase_request = pr
+            item.item_sno = sno
+            if not item.description_po and item.description_pr:
+                item.description_po = item.description_pr
+            item.price_estimated_local_subtotal = (item.price_estimated_local * item.quantity_requested).quantize(TWO_PLACES)
+            item.price_estimated_usd = (item.price_estimated_local / rate).quantize(TWO_PLACES)
+            item.price_estimated_usd_subtotal = (item.price_estimated_usd * item.quantity_requested).quantize(TWO_PLACES)
+            item.created = now_utc
+        return cls.objects.bulk_create(items, batch_size=batch_size)
+
     def get_absolute_url(self):
         return reverse_lazy('pr_view', kwargs={'pk': self.purchase_request.pk}) #args=[str(self.id)])
 
     @property
     def allocation_percent_total(self):
-        total = self.finance_codes.all().aggregate(Sum('allocation_percent'))['allocation_percent__sum']
-        return total
+        # uses the manager's prefetch cache rather than an aggregate query,
+        # so listing N items costs one prefetch query instead of N SUMs
+        return sum((fc.allocation_percent for fc in self.finance_codes.all()), Decimal('0.00'))
 
     class Meta:
         verbose_name = 'Item'
         ordering = ['purchase_request']
         #order_with_respect_to = 'purchase_request'
+        # lets the next-item_sno lookup be satisfied from the index tip
+        index_together = (('purchase_request', 'item_sno'),)
 
 def upload_path_handler(instance, filename):
     return "purchase_request/{office}/pr_{pr_pk}/item_{item_id}/{file}".format(office=instance.item.purchase_request.office.name, pr_pk=instance.item.purchase_request.pk, item_id=instance.item.id, file=filename)
@@ -453,6 +566,7 @@ class ItemAttachment(CommonBaseAbstractModel):
         return reverse_lazy('item_attachment', kwargs={'pk': self.item.purchase_request.pk})
 
 
+@python_2_unicode_compatible
 class FinanceCodes(CommonBaseAbstractModel):
     item = models.ForeignKey(Item, related_name='finance_codes', null=False, blank=False)
     gl_account = models.PositiveIntegerField(validators=[validate_positive, validate_gl_account,], null=False, blank=False)
@@ -467,9 +581,6 @@ class FinanceCodes(CommonBaseAbstractModel):
                                 blank=False, null=False,
                                 default=Decimal("100.00"))
 
-    def __unicode__(self):
-        return "%s-%s" % (self.gl_account, str(self.fund_code))
-
     def __str__(self):
         return "%s-%s" % (self.gl_account, str(self.fund_code))
 
@@ -507,7 +618,9 @@ class RequestForQuotation(CommonBaseAbstractModel):
     quotation_analysis = models.ForeignKey(QuotationAnalysis, related_name='rfqs', null=True, blank=True)
 
     def save(self, *args, **kwargs):
-        self.complete_order_delivery_date = self.rfq_items.aggregate(Max('delivery_date'))
+        if self.pk:
+            # index into the aggregate result; storing the raw dict was wrong
+            self.complete_order_delivery_date = self.rfq_items.aggregate(d=Max('delivery_date'))['d']
         super(RequestForQuotation, self).save(*args, **kwargs)
 
 
@@ -550,8 +663,8 @@ class PurchaseOrder(CommonBaseAbstractModel):
     quotation_analysis = models.ForeignKey(QuotationAnalysis, related_name='purchase_orders', null=True, blank=True)
 
     def save(self, *args, **kwargs):
-        self.total_local = self.purchase_order_items.Aggregate(Sum(price_subtotal_local))
-        self.total_usd = self.purchase_order_items.Aggregate(Sum(price_subtotal_usd))
+        # total_local/total_usd are maintained by the PurchaseOrderItem
+        # signal receivers, so a PO save no longer rescans its items
         if self.quotation_analysis:
             self.vendor = self.quotation_analysis.selected_vendor
             self.expected_delivery_date = self.quotation_analysis.delivery_date
@@ -582,10 +695,14 @@ class PurchaseOrderItem(CommonBaseAbstractModel):
                                         default=Decimal('0.00'),)
     price_subtotal_usd = USDCurrencyField(verbose_name='Subtal US Dollars')
 
+    class Meta:
+        # speeds up the m2m join lookups between orders and items
+        index_together = (('purchase_order', 'item'),)
+
     def save(self, *args, **kwargs):
         self.price_subtotal_local = self.price_local * self.quantity_ordered
         self.price_subtotal_usd = self.price_usd * self.quantity_ordered
-        super(PurchaseOrderItems, self).save(*args, **kwargs)
+        super(PurchaseOrderItem, self).save(*args, **kwargs)
 
 
 class GoodsReceivedNote(CommonBaseAbstractModel):
@@ -613,6 +730,10 @@ class GoodsReceivedNoteItem(CommonBaseAbstractModel):
     item = models.ForeignKey(Item, related_name='goods_received_note_items', on_delete=models.CASCADE)
     quantity_received = models.PositiveIntegerField(validators=[MinValueValidator(0.0)],)
 
+    class Meta:
+        # speeds up the m2m join lookups between notes and items
+        index_together = (('goods_received_note', 'item'),)
+
 
 class PurchaseRecord(CommonBaseAbstractModel):
     # payment_voucher_num
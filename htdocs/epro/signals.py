@@ -0,0 +1,62 @@
+import mimetypes
+import os
+from decimal import Decimal
+
+from django.db.models import Sum
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import (ItemAttachment, PurchaseOrder, PurchaseOrderItem,
+    PurchaseRequestStatus, invalidate_drafted_status_pk)
+
+
+@receiver(pre_save, sender=ItemAttachment)
+def set_attachment_file_meta(sender, instance, **kwargs):
+    """
+    Captures the uploaded file's size and content type right before the row is
+    written, so attachments created outside the form (e.g. bulk inserts) still
+    get their metadata without any per-form save() override.
+    """
+    if instance.file and not instance.file_size:
+        instance.file_size = instance.file.size
+        instance.file_type = getattr(instance.file.file, 'content_type', '') or mimetypes.guess_type(instance.file.name)[0]
+
+
+@receiver(post_delete, sender=ItemAttachment)
+def auto_delete_file_on_delete(sender, instance, **kwargs):
+    """
+    Removes the file from disk when its ItemAttachment row is deleted.
+    A bare unlink that swallows the missing-file error is one syscall per
+    attachment; probing with os.path.isfile first would double that on
+    cascade deletes.
+    """
+    if instance.file:
+        try:
+            os.unlink(instance.file.path)
+        except OSError:
+            pass
+
+
+@receiver(post_save, sender=PurchaseRequestStatus)
+@receiver(post_delete, sender=PurchaseRequestStatus)
+def clear_drafted_status_pk_cache(sender, instance, **kwargs):
+    """
+    The 'Drafted' status pk is cached per process for PR creation; drop the
+    cache whenever the status rows change so it is re-read on next use.
+    """
+    invalidate_drafted_status_pk()
+
+
+@receiver(post_save, sender=PurchaseOrderItem)
+@receiver(post_delete, sender=PurchaseOrderItem)
+def update_purchase_order_totals(sender, instance, **kwargs):
+    """
+    Keeps PurchaseOrder.total_local/total_usd in sync as items change, so
+    the aggregation only runs when an item row is actually written or
+    removed instead of on every PO save.
+    """
+    totals = PurchaseOrderItem.objects.filter(purchase_order_id=instance.purchase_order_id).aggregate(
+        local=Sum('price_subtotal_local'), usd=Sum('price_subtotal_usd'))
+    PurchaseOrder.objects.filter(pk=instance.purchase_order_id).update(
+        total_local=totals['local'] or Decimal('0.00'),
+        total_usd=totals['usd'] or Decimal('0.00'))
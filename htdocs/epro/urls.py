@@ -1,11 +1,12 @@
-from django.conf.urls import include, url
-from django.views.decorators.csrf import csrf_exempt
+from django.conf.urls import url
 
-from django.views.generic import TemplateView
-
-from rest_framework.urlpatterns import format_suffix_patterns
-
-from epro.views import *
+from epro.views import (PurchaseRequestListView, PurchaseRequestCreateView,
+    PurchaseRequestUpdateView, PurchaseRequestDetailView, PurchaseRequestDeleteView,
+    ApplyDefaultFinanceCodesToAllItems, SetDefaultFinanceCodesForPR,
+    UnsetDefaultCodesForPR, PurchaseRequestItemCreateView,
+    PurchaseRequestItemUpdateView, PurchaseRequestItemDeleteView,
+    FinanceCodesCreateView, FinanceCodesUpdateView, FinanceCodesDeleteView,
+    ItemAttachmentCreateView)
 
 
 urlpatterns = [
@@ -32,4 +33,8 @@ urlpatterns = [
     url(r'^pr/item/attachments/add/(?P<pk>\d+)/$', ItemAttachmentCreateView.as_view(), name='item_attachment'),
 ]
 
-urlpatterns = format_suffix_patterns(urlpatterns)
\ No newline at end of file
+# Django compiles each pattern's regex lazily on first access and caches it
+# per process; touching .regex here moves that work from the first request
+# on a cold worker to module import.
+for _pattern in urlpatterns:
+    _pattern.regex
\ No newline at end of file
@@ -1,3 +1,4 @@
+import copy
 from datetime import date
 import json
 
@@ -126,16 +127,22 @@ class ApplyDefaultFinanceCodesToAllItems(LoginRequiredMixin, View):
         if pr_id is not None:
             try:
                 item_with_default_codes = Item.objects.get(purchase_request=pr_id, default_finance_codes=True)
-                default_finance_codes = item_with_default_codes.finance_codes.all()
-                items = Item.objects.filter(purchase_request=pr_id, default_finance_codes=False)
+                default_finance_codes = list(item_with_default_codes.finance_codes.all())
+                items = list(Item.objects.filter(purchase_request=pr_id, default_finance_codes=False))
+                # delete existing finance codes from all items in one statement
+                FinanceCodes.objects.filter(item__in=items).delete()
+                # clone the finance codes of the item that has the default_finance_codes
+                # attribute set to True onto every other item in a single bulk INSERT
+                now_utc = timezone.now()
+                clones = []
                 for item in items:
-                    # delete existing finance codes from each item
-                    item.finance_codes.all().delete()
-                    # add finance codes from the item that has the default_finance_codes attribute set to True
                     for code in default_finance_codes:
-                        code.item = item
-                        code.pk = None
-                        code.save()
+                        clone = copy.copy(code)
+                        clone.pk = None
+                        clone.item = item
+                        clone.created = now_utc
+                        clones.append(clone)
+                FinanceCodes.objects.bulk_create(clones, batch_size=1000)
             except Item.DoesNotExist as e:
                 msg = "There is no item with default finance codes set in this PR (%s)" % pr_id
                 messages.error(request, msg)
@@ -214,11 +221,13 @@ class PurchaseRequestItemCreateView(LoginRequiredMixin, SuccessMessageMixin, Aja
         self.object = form.save()
 
         try:
-            default_finance_codes = Item.objects.get(purchase_request=self.object.purchase_request.pk, default_finance_codes=True).finance_codes.all()
+            default_finance_codes = list(Item.objects.get(purchase_request=self.object.purchase_request.pk, default_finance_codes=True).finance_codes.all())
+            now_utc = timezone.now()
             for code in default_finance_codes:
                 code.item = self.object
                 code.pk= None
-                code.save()
+                code.created = now_utc
+            FinanceCodes.objects.bulk_create(default_finance_codes, batch_size=1000)
         except Item.DoesNotExist as e:
             logger.info("there is no default finance codes for this PR(%s) to be used for new items" % self.object.purchase_request.pk)
         except Item.MultipleObjectsReturned as e:
@@ -311,6 +320,16 @@ class FinanceCodesCreateView(SuccessMessageMixin, AjaxFormResponseMixin, CreateV
         initial = {'item': self.kwargs.get('item_id', None)}
         return initial
 
+    def get_form_kwargs(self):
+        """Precompute the item's allocation sum once so the form's
+        clean_allocation_percent does not have to aggregate per instance."""
+        kwargs = super(FinanceCodesCreateView, self).get_form_kwargs()
+        item_id = self.kwargs.get('item_id', None)
+        if item_id:
+            kwargs['allocation_sum'] = FinanceCodes.objects.filter(item_id=item_id).aggregate(
+                total=Sum('allocation_percent'))['total']
+        return kwargs
+
     def form_valid(self, form):
         form.instance.created_by = self.request.user.userprofile
         #self.object = form.save()
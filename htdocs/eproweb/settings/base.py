@@ -68,8 +68,17 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR + "/templates/",],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Cache compiled templates per process; crispy forms render every
+            # Field/Div via {% include %} of tiny sub-templates, so without
+            # this each form field re-reads and re-parses its template.
+            # APP_DIRS must be off when 'loaders' is set explicitly.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
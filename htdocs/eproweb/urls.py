@@ -17,16 +17,14 @@ from django.conf import settings
 from django.conf.urls import include, url
 from django.conf.urls.static import static
 
-from django.views.generic import TemplateView
-
 from django.contrib import admin
 from django.contrib.auth import views
 
-from rest_framework import routers, serializers, viewsets
+from rest_framework import routers
 
-from .views import *
-from api.users_api import *
-from epro.api import *
+from .views import HomeView, health_view
+from api.users_api import UserViewSet, UserProfileViewSet
+from epro.api import RegionViewSet, CountryViewSet, OfficeViewSet, CurrencyViewSet
 
 admin.autodiscover()
 